@@ -1,6 +1,9 @@
 """Write your own linting rules using regular expressions."""
 
 from . import _version
+from .linter import Finding, Linter
+
+__all__ = ["Finding", "Linter"]
 
 __version__ = _version.version
 VERSION = _version.version_tuple
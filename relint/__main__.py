@@ -7,12 +7,20 @@ import warnings
 from rich.progress import track
 
 from relint.config import load_config
+from relint.metrics import Metrics
 from relint.parse import (
-    lint_file,
+    lint_content,
     match_with_diff_changes,
     parse_diff,
     print_culprits,
     print_github_actions_output,
+    read_files,
+)
+from relint.shard import (
+    parse_shard,
+    read_results,
+    shard_files,
+    write_results,
 )
 
 
@@ -54,13 +62,65 @@ def parse_args(args=None):
         action="store_true",
         help="Do not output warnings. Could be useful when using relint in CI.",
     )
-    (
-        parser.add_argument(
-            "--summarize",
-            action="store_true",
-            help="Summarize the output by grouping matches by test.",
+    add_output_arguments(parser)
+    parser.add_argument(
+        "--read-ahead",
+        metavar="N",
+        type=int,
+        default=0,
+        help=(
+            "Number of files to read ahead in background threads while linting."
+            " Default: 0"
         ),
     )
+    parser.add_argument(
+        "--stats-json",
+        metavar="PATH",
+        type=str,
+        help="Write phase timings and counters as JSON to the given path.",
+    )
+    parser.add_argument(
+        "--shard",
+        metavar="i/N",
+        type=parse_shard,
+        help="Only lint the i-th of N deterministic partitions of the given files.",
+    )
+    parser.add_argument(
+        "--shard-weighted",
+        action="store_true",
+        help="Balance shards by file size instead of a hash of the file path.",
+    )
+    parser.add_argument(
+        "--results-json",
+        metavar="PATH",
+        type=str,
+        help="Write all matches as JSON to the given path, see `relint merge`.",
+    )
+    return parser.parse_args(args=args)
+
+
+def parse_merge_args(args=None):
+    parser = argparse.ArgumentParser(
+        prog="relint merge",
+        description="Combine and render the results of multiple relint shards.",
+    )
+    parser.add_argument(
+        "results",
+        metavar="RESULTS_FILE",
+        type=str,
+        nargs="+",
+        help="Path to one or multiple files written with --results-json.",
+    )
+    add_output_arguments(parser)
+    return parser.parse_args(args=args)
+
+
+def add_output_arguments(parser):
+    parser.add_argument(
+        "--summarize",
+        action="store_true",
+        help="Summarize the output by grouping matches by test.",
+    )
     parser.add_argument(
         "--code-padding",
         type=int,
@@ -70,10 +130,26 @@ def parse_args(args=None):
             "Set to -1 disable code snippet output."
         ),
     )
-    return parser.parse_args(args=args)
+    parser.add_argument(
+        "--max-annotations-per-file",
+        metavar="N",
+        type=int,
+        help="Limit GitHub Actions annotations per file, default: unlimited",
+    )
+    parser.add_argument(
+        "--max-annotations-per-rule",
+        metavar="N",
+        type=int,
+        help="Limit GitHub Actions annotations per rule, default: unlimited",
+    )
 
 
 def main(args=None):
+    # The first argument "merge" is reserved for the subcommand,
+    # a file of that name can be passed as "./merge" instead.
+    args = sys.argv[1:] if args is None else list(args)
+    if args[:1] == ["merge"]:
+        return merge(args[1:])
     args = parse_args(args=args)
     if args.version:
         from . import __version__
@@ -81,30 +157,62 @@ def main(args=None):
         print(f"relint: {__version__}")
         exit(0)
 
-    tests = list(load_config(args.config, args.fail_warnings, args.ignore_warnings))
+    metrics = Metrics()
+    hook = metrics if args.stats_json else None
+    with metrics.timer("config_load"):
+        tests = list(load_config(args.config, args.fail_warnings, args.ignore_warnings))
+
+    with metrics.timer("discovery"):
+        files = discover_files(args)
 
     matches = []
-    for path in track(args.files, description="Linting files..."):
-        matches.extend(lint_file(path, tests))
-
-    output = ""
-    if args.diff:
-        output = sys.stdin.read()
-    elif args.git_diff:
-        output = subprocess.check_output(
-            ["git", "diff", "--staged", "--unified=0", "--no-color"],  # noqa: S607
-            text=True,
-        )
+    for path, content in track(
+        read_files(files, tests, read_ahead=args.read_ahead, hook=hook),
+        total=len(files),
+        description="Linting files...",
+    ):
+        if content is not None:
+            matches.extend(lint_content(path, content, tests, hook=hook))
+
     if args.diff or args.git_diff:
-        changed_content = parse_diff(output)
-        matches = match_with_diff_changes(changed_content, matches)
+        with metrics.timer("diff_parse"):
+            if args.diff:
+                output = sys.stdin.read()
+            else:
+                output = subprocess.check_output(
+                    ["git", "diff", "--staged", "--unified=0", "--no-color"],  # noqa: S607
+                    text=True,
+                )
+            changed_content = parse_diff(output)
+        with metrics.timer("diff_filter"):
+            matches = list(match_with_diff_changes(changed_content, matches))
+
+    if args.results_json:
+        write_results(args.results_json, matches)
+
+    with metrics.timer("render"):
+        exit_code = render(matches, args)
+    if args.stats_json:
+        metrics.write_json(args.stats_json)
+    exit(exit_code)
+
 
+def discover_files(args):
+    if args.shard:
+        return shard_files(args.files, *args.shard, weighted=args.shard_weighted)
+    return list(args.files)
+
+
+def merge(args=None):
+    args = parse_merge_args(args=args)
+    exit(render(read_results(args.results), args))
+
+
+def render(matches, args):
     GITHUB_ACTIONS = os.getenv("GITHUB_ACTIONS") == "true"
     if GITHUB_ACTIONS:
-        exit_code = print_github_actions_output(matches, args)
-    else:
-        exit_code = print_culprits(matches, args)
-    exit(exit_code)
+        return print_github_actions_output(matches, args)
+    return print_culprits(matches, args)
 
 
 if not sys.warnoptions:
@@ -23,30 +23,41 @@ Test = collections.namedtuple(
 
 
 def load_config(path, fail_warnings, ignore_warnings):
+    yield from parse_config(read_config(path), fail_warnings, ignore_warnings)
+
+
+def read_config(path):
+    """Return the raw list of rules from a YAML or JSON config file."""
     with open(path) as fs:
         try:
-            for test in yaml.safe_load(fs):
-                if ignore_warnings and not test.get("error", True):
-                    continue
-
-                file_pattern = test.get("filePattern", ".*")
-                file_pattern = re.compile(file_pattern)
-                yield Test(
-                    name=test["name"],
-                    pattern=re.compile(test["pattern"]),
-                    hint=test.get("hint"),
-                    file_pattern=file_pattern,
-                    error=test.get("error", True) or fail_warnings,
-                )
+            return yaml.safe_load(fs)
         except yaml.YAMLError as e:
             raise ConfigError("Error parsing your relint config file.") from e
-        except TypeError:
-            warnings.warn(
-                "Your relint config is empty, no tests were executed.",
-                UserWarning,
-                stacklevel=2,
+
+
+def parse_config(config, fail_warnings, ignore_warnings):
+    """Yield a compiled test for each rule in a list of rule dictionaries."""
+    try:
+        for test in config:
+            if ignore_warnings and not test.get("error", True):
+                continue
+
+            file_pattern = test.get("filePattern", ".*")
+            file_pattern = re.compile(file_pattern)
+            yield Test(
+                name=test["name"],
+                pattern=re.compile(test["pattern"]),
+                hint=test.get("hint"),
+                file_pattern=file_pattern,
+                error=test.get("error", True) or fail_warnings,
             )
-        except (AttributeError, ValueError) as e:
-            raise ConfigError(
-                "Your relint config is not a valid YAML list of relint tests."
-            ) from e
+    except TypeError:
+        warnings.warn(
+            "Your relint config is empty, no tests were executed.",
+            UserWarning,
+            stacklevel=2,
+        )
+    except (AttributeError, ValueError) as e:
+        raise ConfigError(
+            "Your relint config is not a valid YAML list of relint tests."
+        ) from e
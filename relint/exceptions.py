@@ -4,3 +4,7 @@ class RelintError(Exception):
 
 class ConfigError(ValueError, RelintError):
     pass
+
+
+class ResultsError(ValueError, RelintError):
+    pass
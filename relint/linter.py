@@ -0,0 +1,129 @@
+import collections
+
+from .config import parse_config, read_config
+from .parse import (
+    match_position,
+    parse_diff,
+    read_files,
+    scan_content,
+)
+
+Finding = collections.namedtuple(
+    "Finding",
+    (
+        "filename",
+        "rule",
+        "error",
+        "line",
+        "end_line",
+        "col",
+        "end_col",
+    ),
+)
+
+
+class Linter:
+    """
+    Lint text, files and diffs against a fixed set of rules.
+
+    Rules are compiled once and the tests applying to a filename are cached,
+    so a single instance can be reused for many requests,
+    e.g. in a long-lived process.
+
+    Args:
+        rules (list): Rule dictionaries, as found in a relint config file.
+        fail_warnings (bool): Treat warnings as errors.
+        ignore_warnings (bool): Skip rules that are only warnings.
+        hook (callable): Optional callback for timings and counters,
+            see :class:`relint.metrics.Metrics`.
+        cache_size (int): Number of filenames to cache applicable tests for.
+            Each lookup served from this cache is reported as ``cache_hits``,
+            instead of the file patterns shared between tests.
+
+    """
+
+    def __init__(
+        self,
+        rules,
+        fail_warnings=False,
+        ignore_warnings=False,
+        hook=None,
+        cache_size=4096,
+    ):
+        self.tests = tuple(parse_config(rules, fail_warnings, ignore_warnings))
+        self.hook = hook
+        self.cache_size = cache_size
+        self.file_patterns = tuple(dict.fromkeys(t.file_pattern for t in self.tests))
+        self._applicable = {}
+
+    @classmethod
+    def from_config(cls, path, **kwargs):
+        """Create a linter from a YAML or JSON config file."""
+        return cls(read_config(path), **kwargs)
+
+    def lint_text(self, name, text):
+        """Return all findings in ``text``, applying the rules for filename ``name``."""
+        return self._lint(name, text)
+
+    def lint_paths(self, paths, read_ahead=0):
+        """Return all findings in the given files."""
+        findings = []
+        for filename, content in self._read(paths, read_ahead):
+            findings.extend(self._lint(filename, content))
+        return findings
+
+    def lint_diff(self, diff_text, read_ahead=0):
+        """Return all findings on lines changed by a unified diff with zero context."""
+        changed_content = parse_diff(diff_text)
+        paths = [filename for filename, lines in changed_content.items() if lines]
+        findings = []
+        for filename, content in self._read(paths, read_ahead):
+            findings.extend(
+                self._lint(filename, content, set(changed_content[filename]))
+            )
+        return findings
+
+    def _applicable_tests(self, filename):
+        try:
+            tests = self._applicable[filename]
+        except KeyError:
+            if len(self._applicable) >= self.cache_size:
+                self._applicable.pop(next(iter(self._applicable)), None)
+            matching = {p for p in self.file_patterns if p.match(filename)}
+            tests = self._applicable[filename] = tuple(
+                t for t in self.tests if t.file_pattern in matching
+            )
+        else:
+            if self.hook:
+                self.hook("cache_hits", 1)
+        return tests
+
+    def _read(self, paths, read_ahead):
+        for filename, content in read_files(
+            paths, self.tests, read_ahead=read_ahead, hook=self.hook
+        ):
+            if content is not None:
+                yield filename, content
+
+    def _lint(self, filename, content, lines=None):
+        # The scan stores the line index it builds, so positions reuse it.
+        indexes = {}
+        findings = []
+        for _, test, match, line_number in scan_content(
+            filename,
+            content,
+            self._applicable_tests(filename),
+            hook=self.hook,
+            indexes=indexes,
+        ):
+            if lines is None or line_number in lines:
+                findings.append(
+                    Finding(
+                        filename,
+                        test.name,
+                        test.error,
+                        line_number,
+                        *match_position(match, line_number, indexes[filename]),
+                    )
+                )
+        return findings
@@ -0,0 +1,63 @@
+import contextlib
+import json
+import threading
+import time
+
+PHASES = (
+    "config_load",
+    "discovery",
+    "read",
+    "scan",
+    "diff_parse",
+    "diff_filter",
+    "render",
+)
+COUNTERS = (
+    "files_read",
+    "bytes_read",
+    "files_skipped_binary",
+    "files_skipped_inapplicable",
+    "regex_executions",
+    "matches",
+    "cache_hits",
+)
+
+
+class Metrics:
+    """
+    Collect phase timings and counters of a relint run.
+
+    Instances are callables and can be passed as ``hook`` to
+    :func:`relint.parse.lint_file`, which calls them with an event name
+    and a value: the elapsed seconds for phases and the increment for counters.
+    Any other callable with the same signature can be used as a hook, too.
+    Events may be reported from multiple threads.
+    """
+
+    def __init__(self):
+        self.timings = dict.fromkeys(PHASES, 0.0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self._lock = threading.Lock()
+
+    def __call__(self, event, value):
+        with self._lock:
+            if event in self.timings:
+                self.timings[event] += value
+            else:
+                self.counters[event] = self.counters.get(event, 0) + value
+
+    @contextlib.contextmanager
+    def timer(self, phase):
+        """Measure the time spent within the context as ``phase``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self(phase, time.perf_counter() - start)
+
+    def as_dict(self):
+        return {"timings": dict(self.timings), "counters": dict(self.counters)}
+
+    def write_json(self, path):
+        with open(path, "w") as fs:
+            json.dump(self.as_dict(), fs, indent=2)
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
+import bisect
 import collections
+import concurrent.futures
+import functools
+import os
+import sys
+import time
 
 try:
     import regex as re
@@ -21,20 +27,326 @@ GIT_DIFF_FILENAME_PATTERN = re.compile(
 GIT_DIFF_SPLIT_PATTERN = re.compile(
     rf"(?:\n|^)diff --git {GIT_DIFF_PREFIX_PATTERN}.* {GIT_DIFF_PREFIX_PATTERN}.*(?:\n|$)"
 )
+NEWLINE_PATTERN = re.compile(r"\n")
+SUPPRESSION_PATTERN = re.compile(
+    r"relint:[^\S\n]*(disable(?:-next-line)?)(?:=(.*?))?[^\S\n]*(?:\*/|-->)?[^\S\n]*$",
+    re.MULTILINE,
+)
+GITHUB_ACTIONS_BUFFER_SIZE = 1024
+NUMPY_MIN_SIZE = 1 << 16
+NUMPY_MIN_BATCH = 32
+NUMPY_INDEX_RATIO = 4
+
+
+def lint_file(filename, tests, hook=None):
+    """
+    Lint a file against all applicable tests.
+
+    Args:
+        filename (str): Path to the file.
+        tests (list): Tests as returned by :func:`relint.config.load_config`.
+        hook (callable): Optional callback, receiving an event name and a value
+            for all phase timings and counters, see :class:`relint.metrics.Metrics`.
 
+    Yields:
+        tuple: Filename, test, match and line number of each finding.
 
-def lint_file(filename, tests):
+    """
+    content = read_file(filename, tests, hook=hook)
+    if content is not None:
+        yield from lint_content(filename, content, tests, hook=hook)
+
+
+def read_file(filename, tests, hook=None):
+    """Return the content of a file or ``None`` if it can't or needn't be linted."""
+    if not any(test.file_pattern.match(filename) for test in tests):
+        if hook:
+            hook("files_skipped_inapplicable", 1)
+        return None
+    start = time.perf_counter()
     try:
         with open(filename) as fs:
             content = fs.read()
-    except (IsADirectoryError, UnicodeDecodeError):
-        pass
-    else:
-        for test in tests:
-            if test.file_pattern.match(filename):
-                for match in test.pattern.finditer(content):
-                    line_number = match.string[: match.start()].count("\n") + 1
-                    yield filename, test, match, line_number
+            size = os.fstat(fs.fileno()).st_size
+    except IsADirectoryError:
+        if hook:
+            hook("files_skipped_inapplicable", 1)
+        return None
+    except UnicodeDecodeError:
+        if hook:
+            hook("files_skipped_binary", 1)
+        return None
+    if hook:
+        hook("read", time.perf_counter() - start)
+        hook("files_read", 1)
+        hook("bytes_read", size)
+    return content
+
+
+def read_files(filenames, tests, read_ahead=0, hook=None):
+    """
+    Read files in order, prefetching upcoming files in background threads.
+
+    Args:
+        filenames (list): Paths to the files.
+        tests (list): Tests as returned by :func:`relint.config.load_config`.
+        read_ahead (int): Number of files read ahead of the consumer,
+            ``0`` reads each file only when it is requested.
+        hook (callable): Optional callback, see :func:`lint_file`.
+            It may be called from worker threads.
+
+    Yields:
+        tuple: Filename and content as returned by :func:`read_file`.
+
+    """
+    if read_ahead < 1:
+        for filename in filenames:
+            yield filename, read_file(filename, tests, hook=hook)
+        return
+
+    pending = collections.deque()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=read_ahead) as executor:
+        try:
+            for filename in filenames:
+                pending.append(
+                    (filename, executor.submit(read_file, filename, tests, hook))
+                )
+                if len(pending) > read_ahead:
+                    filename, future = pending.popleft()
+                    yield filename, future.result()
+            while pending:
+                filename, future = pending.popleft()
+                yield filename, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def lint_content(filename, content, tests, hook=None):
+    """Lint the content of a file, see :func:`lint_file`."""
+    yield from scan_content(
+        filename, content, applicable_tests(filename, tests, hook=hook), hook=hook
+    )
+
+
+def scan_content(filename, content, tests, hook=None, indexes=None):
+    """
+    Lint the content of a file against tests that are known to apply to it.
+
+    If an ``indexes`` dict is given, the line index of the content is stored
+    in it by filename, see :func:`cached_line_index`, to be reused afterwards.
+    """
+    index = suppressions = None
+    for test in tests:
+        start = time.perf_counter()
+        matches = list(test.pattern.finditer(content))
+        if hook:
+            hook("scan", time.perf_counter() - start)
+            hook("regex_executions", 1)
+        if not matches:
+            continue
+        if index is None:
+            index = (
+                line_index(content)
+                if indexes is None
+                else cached_line_index(indexes, filename, content)
+            )
+            suppressions = parse_suppressions(content, index)
+        positions = locate(index, [match.start() for match in matches])
+        findings = [
+            (filename, test, match, line_number)
+            for match, (line_number, _) in zip(matches, positions, strict=True)
+            if not is_suppressed(suppressions, line_number, test)
+        ]
+        if hook:
+            hook("matches", len(findings))
+        yield from findings
+
+
+def applicable_tests(filename, tests, hook=None):
+    """Yield all tests whose file pattern matches, each pattern is only matched once."""
+    applicable = {}
+    for test in tests:
+        try:
+            is_applicable = applicable[test.file_pattern]
+        except KeyError:
+            is_applicable = applicable[test.file_pattern] = bool(
+                test.file_pattern.match(filename)
+            )
+        else:
+            if hook:
+                hook("cache_hits", 1)
+        if is_applicable:
+            yield test
+
+
+@functools.cache
+def _numpy():
+    """Return the NumPy module or ``None``, importing it only once it is needed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class LineIndex:
+    """
+    Newline offsets of a text, starting with a ``-1`` sentinel.
+
+    ``offsets`` is a plain tuple for bisecting single matches. ``array`` holds
+    the same offsets as a NumPy array, once it has been built for batches.
+    """
+
+    __slots__ = ("offsets", "array")
+
+    def __init__(self, offsets, array=None):
+        self.offsets = offsets
+        self.array = array
+
+
+def line_index(content):
+    """
+    Return the offsets of all newline characters in ``content``.
+
+    The index starts with a ``-1`` sentinel for the virtual newline before
+    the first line. Large files are indexed using NumPy, if it is installed.
+    """
+    if len(content) >= NUMPY_MIN_SIZE and (np := _numpy()) is not None:
+        if content.isascii():
+            data = np.frombuffer(content.encode("ascii"), dtype=np.uint8)
+        else:
+            data = np.frombuffer(
+                content.encode("utf-32-le", "surrogatepass"), dtype=np.uint32
+            )
+        newlines = np.flatnonzero(data == ord("\n"))
+        array = np.empty(len(newlines) + 1, dtype=np.intp)
+        array[0] = -1
+        array[1:] = newlines
+        return LineIndex(tuple(array.tolist()), array)
+    return LineIndex(
+        (-1, *(match.start() for match in NEWLINE_PATTERN.finditer(content)))
+    )
+
+
+def locate(index, offsets):
+    """
+    Return the 1-based line and column of each offset.
+
+    Batches of at least ``NUMPY_MIN_BATCH`` offsets are resolved in a single
+    NumPy call, if it is installed and the index already has an array.
+    Otherwise, the array is only built if there are at least
+    ``1 / NUMPY_INDEX_RATIO`` as many offsets as lines, and then kept
+    on the index for further batches.
+
+    Args:
+        index (LineIndex): Newline offsets as returned by :func:`line_index`.
+        offsets (list): Character offsets within the indexed content.
+
+    Returns:
+        list: A line and column tuple for each offset.
+
+    """
+    newlines = index.offsets
+    if (
+        len(offsets) >= NUMPY_MIN_BATCH
+        and (
+            index.array is not None or len(offsets) * NUMPY_INDEX_RATIO >= len(newlines)
+        )
+        and (np := _numpy()) is not None
+    ):
+        if index.array is None:
+            index.array = np.array(newlines, dtype=np.intp)
+        offsets = np.asarray(offsets, dtype=np.intp)
+        lines = np.searchsorted(index.array, offsets)
+        return list(
+            zip(
+                lines.tolist(),
+                (offsets - index.array[lines - 1]).tolist(),
+                strict=True,
+            )
+        )
+    positions = []
+    for offset in offsets:
+        line = bisect.bisect_left(newlines, offset)
+        positions.append((line, offset - newlines[line - 1]))
+    return positions
+
+
+def match_position(match, line_number, index):
+    """
+    Return the end line, start column and end column of a match, all 1-based.
+
+    Args:
+        match: Regex match, as yielded by :func:`lint_file`.
+        line_number (int): Line number of the match start, as yielded by :func:`lint_file`.
+        index (LineIndex): Newline offsets of the matched content, see :func:`line_index`.
+
+    Returns:
+        tuple: End line, start column and end column.
+
+    """
+    newlines = index.offsets
+    start, end = match.start(), match.end()
+    end_line = bisect.bisect_left(newlines, end, line_number)
+    return end_line, start - newlines[line_number - 1], end - newlines[end_line - 1]
+
+
+def cached_line_index(indexes, filename, content):
+    """Return the :func:`line_index` of a file, stored in ``indexes`` by filename."""
+    try:
+        return indexes[filename]
+    except KeyError:
+        index = indexes[filename] = line_index(content)
+        return index
+
+
+def is_suppressed(suppressions, line_number, test):
+    """Return whether a test is suppressed on the given line."""
+    if line_number not in suppressions:
+        return False
+    rules = suppressions[line_number]
+    return rules is None or test.name in rules
+
+
+def parse_suppressions(content, index):
+    """
+    Collect all inline suppression comments of a file.
+
+    A ``relint: disable`` comment silences findings on its own line,
+    ``relint: disable-next-line`` on the line that follows.
+    Both accept a comma separated list of rule names, like
+    ``relint: disable=No ToDo,No fixme``, and silence all rules otherwise.
+
+    Args:
+        content (str): File content.
+        index: Newline offsets as returned by :func:`line_index`.
+
+    Returns:
+        dict: Line numbers mapped to a set of suppressed rule names
+        or ``None`` if all rules are suppressed.
+
+    """
+    suppressions = {}
+    if "relint:" not in content:
+        return suppressions
+    matches = list(SUPPRESSION_PATTERN.finditer(content))
+    positions = locate(index, [match.start() for match in matches])
+    for match, (line_number, _) in zip(matches, positions, strict=True):
+        if match.group(1) == "disable-next-line":
+            line_number += 1
+        rules = match.group(2)
+        if (
+            rules is None
+            or line_number in suppressions
+            and suppressions[line_number] is None
+        ):
+            suppressions[line_number] = None
+        else:
+            suppressions.setdefault(line_number, set()).update(
+                name.strip() for name in rules.split(",") if name.strip()
+            )
+    return suppressions
 
 
 def parse_line_numbers(output):
@@ -99,25 +411,59 @@ def split_diff_content_by_filename(output: str) -> {str: str}:
 
 
 def print_github_actions_output(matches, args):
+    """
+    Write matches as GitHub Actions workflow annotations.
+
+    Annotations are streamed in buffered chunks and grouped by consecutive
+    filename. Annotations beyond ``args.max_annotations_per_file``
+    or ``args.max_annotations_per_rule`` are omitted and summarized
+    in a single notice, but still count towards the exit code.
+    """
     exit_code = 0
-    groups = collections.defaultdict(list)
-    for filename, test, match, _ in matches:
+    max_per_file = args.max_annotations_per_file
+    max_per_rule = args.max_annotations_per_rule
+    per_file = collections.Counter()
+    per_rule = collections.Counter()
+    omitted = collections.Counter()
+    buffer = []
+    group = index = None
+    for filename, test, match, start_line_no in matches:
         exit_code = test.error if exit_code == 0 else exit_code
-        start_line_no = match.string[: match.start()].count("\n") + 1
-        end_line_no = match.string[: match.end()].count("\n") + 1
-        col = match.start() - match.string.rfind("\n", 0, match.start())
-        col_end = match.end() - match.string.rfind("\n", 0, match.end())
-
-        groups[filename].append(
+        if (max_per_file is not None and per_file[filename] >= max_per_file) or (
+            max_per_rule is not None and per_rule[test.name] >= max_per_rule
+        ):
+            omitted[test.name] += 1
+            continue
+        per_file[filename] += 1
+        per_rule[test.name] += 1
+
+        if filename != group:
+            if group is not None:
+                buffer.append("::endgroup::\n")
+            buffer.append(f"::group::{filename}\n")
+            group = filename
+            # Groups follow consecutive filenames, only keep the current index.
+            index = line_index(match.string)
+        end_line_no, col, col_end = match_position(match, start_line_no, index)
+        buffer.append(
             f"::{'error' if test.error else 'warning'} file={filename},"
             f"line={start_line_no},endLine={end_line_no},col={col},colEnd={col_end},"
             f"title={test.name}::{test.hint}".replace("\n", "%0A")
+            + "\n"
         )
-    for filename, messages in groups.items():
-        print(f"::group::{filename}")
-        for annotation in messages:
-            print(annotation)
-        print("::endgroup::")
+        if len(buffer) >= GITHUB_ACTIONS_BUFFER_SIZE:
+            sys.stdout.write("".join(buffer))
+            buffer.clear()
+    if group is not None:
+        buffer.append("::endgroup::\n")
+    if omitted:
+        details = ", ".join(f"{name} ({count})" for name, count in omitted.items())
+        buffer.append(
+            f"::notice title=relint::Omitted {omitted.total()} annotation(s) "
+            f"beyond the annotation caps: {details}".replace("\n", "%0A")
+            + "\n"
+        )
+    sys.stdout.write("".join(buffer))
     return exit_code
 
 
@@ -125,19 +471,20 @@ def print_culprits(matches, args):
     exit_code = 0
     messages = []
     match_groups = collections.defaultdict(list)
+    indexed = index = None
 
-    for filename, test, match, _ in matches:
+    for filename, test, match, start_line_no in matches:
         exit_code = test.error if exit_code == 0 else exit_code
 
-        start_line_no = match.string[: match.start()].count("\n") + 1
-        end_line_no = match.string[: match.end()].count("\n") + 1
-
         if args.summarize:
             match_groups[test].append(f"{filename}:{start_line_no}")
         else:
             message_bits = []
 
             if args.code_padding != -1:
+                if filename != indexed:
+                    indexed, index = filename, line_index(match.string)
+                end_line_no, _, _ = match_position(match, start_line_no, index)
                 lexer = Syntax.guess_lexer(filename)
                 message_bits.append(
                     Syntax(
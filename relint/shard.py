@@ -0,0 +1,154 @@
+import argparse
+import json
+import os
+import zlib
+
+from .config import Test
+from .exceptions import ResultsError
+
+RESULTS_VERSION = 1
+
+
+class StoredMatch:
+    """A regex match restored from a results file."""
+
+    __slots__ = ("string", "_start", "_end")
+
+    def __init__(self, string, start, end):
+        self.string = string
+        self._start = start
+        self._end = end
+
+    def start(self):
+        return self._start
+
+    def end(self):
+        return self._end
+
+
+def parse_shard(value):
+    """Parse a 1-based ``i/N`` shard argument into a tuple."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid shard {value!r}, expected i/N")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(
+            f"invalid shard {value!r}, expected 1 <= i <= N"
+        )
+    return index, count
+
+
+def shard_files(filenames, index, count, weighted=False):
+    """
+    Return the files that belong to a shard.
+
+    Files are partitioned by a stable hash of their path, so that every node
+    gets the same partition for the same file list, independent of its order.
+    If ``weighted`` is set, files are instead distributed by size,
+    largest first, to the shard with the fewest bytes so far.
+
+    Args:
+        filenames (list): Paths to all files.
+        index (int): 1-based index of the shard.
+        count (int): Total number of shards.
+        weighted (bool): Balance shards by file size.
+
+    Returns:
+        list: Paths in the shard, in their original order.
+
+    """
+    if not weighted:
+        return [
+            filename
+            for filename in filenames
+            if zlib.crc32(filename.encode()) % count == index - 1
+        ]
+    loads = [0] * count
+    selected = set()
+    for size, filename in sorted(
+        ((_file_size(filename), filename) for filename in set(filenames)),
+        key=lambda item: (-item[0], item[1]),
+    ):
+        shard = loads.index(min(loads))
+        loads[shard] += size
+        if shard == index - 1:
+            selected.add(filename)
+    return [filename for filename in filenames if filename in selected]
+
+
+def _file_size(filename):
+    try:
+        return os.path.getsize(filename)
+    except OSError:
+        return 0
+
+
+def write_results(path, matches):
+    """
+    Write matches to a JSON results file, that can be merged later.
+
+    The file includes the content of all files with matches,
+    which is needed to render code snippets.
+    """
+    rules = {}
+    files = {}
+    results = []
+    for filename, test, match, line_number in matches:
+        rule = rules.setdefault(test, len(rules))
+        files.setdefault(filename, match.string)
+        results.append([filename, rule, match.start(), match.end(), line_number])
+    with open(path, "w") as fs:
+        json.dump(
+            {
+                "version": RESULTS_VERSION,
+                "rules": [
+                    {"name": test.name, "hint": test.hint, "error": test.error}
+                    for test in rules
+                ],
+                "files": files,
+                "matches": results,
+            },
+            fs,
+        )
+
+
+def read_results(paths):
+    """Read and combine the matches of multiple JSON results files."""
+    matches = []
+    for path in paths:
+        matches.extend(_read_results(path))
+    return matches
+
+
+def _read_results(path):
+    with open(path) as fs:
+        try:
+            data = json.load(fs)
+        except ValueError as e:
+            raise ResultsError(f"Error parsing relint results file: {path}") from e
+    if not isinstance(data, dict) or data.get("version") != RESULTS_VERSION:
+        raise ResultsError(f"Unsupported relint results file: {path}")
+    try:
+        tests = [
+            Test(
+                name=rule["name"],
+                pattern=None,
+                hint=rule["hint"],
+                file_pattern=None,
+                error=rule["error"],
+            )
+            for rule in data["rules"]
+        ]
+        files = data["files"]
+        return [
+            (
+                filename,
+                tests[rule],
+                StoredMatch(files[filename], start, end),
+                line_number,
+            )
+            for filename, rule, start, end, line_number in data["matches"]
+        ]
+    except (AttributeError, KeyError, IndexError, TypeError, ValueError) as e:
+        raise ResultsError(f"Malformed relint results file: {path}") from e
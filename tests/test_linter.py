@@ -0,0 +1,102 @@
+import pytest
+from relint import Finding, Linter
+from relint.exceptions import ConfigError
+from relint.metrics import Metrics
+from relint.parse import line_index as line_index_func
+
+RULES = [
+    {
+        "name": "No ToDo",
+        "pattern": "[tT][oO][dD][oO]",
+        "filePattern": r".*\.py",
+        "error": False,
+    },
+    {"name": "No fixme", "pattern": "(?i)fixme\n?", "filePattern": r".*\.py"},
+]
+
+
+class TestLinter:
+    def test_lint_text(self):
+        linter = Linter(RULES)
+
+        assert linter.lint_text("dummy.py", "# TODO\n# FIXME\nx") == [
+            Finding("dummy.py", "No ToDo", False, 1, 1, 3, 7),
+            Finding("dummy.py", "No fixme", True, 2, 3, 3, 1),
+        ]
+        assert linter.lint_text("dummy.js", "# TODO") == []
+
+    def test_lint_text__suppressions(self):
+        linter = Linter(RULES)
+
+        assert linter.lint_text("dummy.py", "# TODO  relint: disable") == []
+
+    def test_lint_text__cache(self):
+        metrics = Metrics()
+        linter = Linter(RULES, hook=metrics, cache_size=1)
+        linter.lint_text("dummy.py", "")
+        linter.lint_text("dummy.py", "")
+
+        assert metrics.counters["cache_hits"] == 1
+
+        linter.lint_text("dummy.js", "")
+        assert list(linter._applicable) == ["dummy.js"]
+
+    def test_lint_text__shared_index(self, mocker):
+        line_index = mocker.patch("relint.parse.line_index", wraps=line_index_func)
+        Linter(RULES).lint_text("dummy.py", "# TODO\n# FIXME\n# TODO")
+
+        assert line_index.call_count == 1
+
+    def test_lint_text__fail_warnings(self):
+        linter = Linter(RULES, fail_warnings=True)
+
+        assert linter.lint_text("dummy.py", "# TODO")[0].error is True
+
+    def test_lint_text__ignore_warnings(self):
+        linter = Linter(RULES, ignore_warnings=True)
+
+        assert linter.lint_text("dummy.py", "# TODO") == []
+
+    def test_lint_text__hook(self):
+        metrics = Metrics()
+        linter = Linter(RULES, hook=metrics)
+        linter.lint_text("dummy.py", "# TODO")
+
+        assert metrics.counters["matches"] == 1
+        assert metrics.counters["regex_executions"] == 2
+
+    def test_lint_paths(self, tmpdir):
+        tmpdir.join("dummy.py").write("# TODO")
+        tmpdir.join("other.py").write("")
+        with tmpdir.as_cwd():
+            findings = Linter(RULES).lint_paths(["dummy.py", "other.py", "a.txt"])
+
+        assert findings == [Finding("dummy.py", "No ToDo", False, 1, 1, 3, 7)]
+
+    def test_lint_diff(self, tmpdir):
+        tmpdir.join("dummy.py").write("# TODO\n# TODO\n")
+        diff = (
+            "diff --git a/dummy.py b/dummy.py\n"
+            "@@ -1,0 +2 @@\n"
+            "+# TODO\n"
+            "diff --git a/deleted.py b/deleted.py\n"
+            "@@ -1 +0,0 @@\n"
+            "-# TODO\n"
+        )
+        with tmpdir.as_cwd():
+            findings = Linter(RULES).lint_diff(diff)
+
+        assert findings == [Finding("dummy.py", "No ToDo", False, 2, 2, 3, 7)]
+
+    def test_from_config(self, fixture_dir):
+        linter = Linter.from_config(fixture_dir / ".relint.yml")
+
+        assert [test.name for test in linter.tests] == [
+            "No ToDo",
+            "No fixme (warning)",
+            "no hint",
+        ]
+
+    def test_invalid_rules(self):
+        with pytest.raises(ConfigError):
+            Linter({"name": "No ToDo"})
@@ -15,6 +15,15 @@ def test_version(tmpdir, capsys):
     assert f"relint: {relint.__version__}" in capsys.readouterr().out
 
 
+def test_version__sys_argv(monkeypatch, tmpdir, capsys):
+    monkeypatch.setattr(sys, "argv", ["relint", "--version"])
+    with tmpdir.as_cwd():
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+    assert exc_info.value.code == 0
+    assert f"relint: {relint.__version__}" in capsys.readouterr().out
+
+
 class TestMain:
     def test_main_execution(self, tmpdir, fixture_dir):
         with (fixture_dir / ".relint.yml").open() as fs:
@@ -76,6 +85,20 @@ class TestMain:
         assert "dummy.py:1" in out
         assert "Error: no hint" in out
 
+    def test_read_ahead(self, capsys, tmpdir, fixture_dir):
+        with (fixture_dir / ".relint.yml").open() as fs:
+            config = fs.read()
+        tmpdir.join(".relint.yml").write(config)
+        tmpdir.join("dummy.py").write("# FIXME do something")
+        tmpdir.join("empty.py").write("")
+        with tmpdir.as_cwd():
+            with pytest.raises(SystemExit) as exc_info:
+                main(["empty.py", "dummy.py", "--read-ahead=4"])
+
+        out, _ = capsys.readouterr()
+        assert "dummy.py:1" in out
+        assert exc_info.value.code == 1
+
     def test_raise_for_warnings(self, tmpdir, fixture_dir):
         with (fixture_dir / ".relint.yml").open() as fs:
             config = fs.read()
@@ -147,3 +170,38 @@ class TestMain:
         out, _ = capsys.readouterr()
         assert "Get it done right away!" in out
         assert exc_info.value.code == 0
+
+    def test_main_execution__github_workflow_output_caps(
+        self, monkeypatch, capsys, tmpdir, fixture_dir
+    ):
+        monkeypatch.setenv("GITHUB_ACTIONS", "true")
+        monkeypatch.setattr("relint.parse.GITHUB_ACTIONS_BUFFER_SIZE", 1)
+        with (fixture_dir / ".relint.yml").open() as fs:
+            config = fs.read()
+        tmpdir.join(".relint.yml").write(config)
+        tmpdir.join("dummy.py").write("# FIXME\n# FIXME\n# FIXME\n# TODO\n")
+        tmpdir.join("other.py").write("# FIXME\n")
+        with tmpdir.as_cwd():
+            with pytest.raises(SystemExit) as exc_info:
+                main(
+                    [
+                        "dummy.py",
+                        "other.py",
+                        "--max-annotations-per-file=2",
+                        "--max-annotations-per-rule=2",
+                    ]
+                )
+
+        out, _ = capsys.readouterr()
+        hint = out.split("title=No fixme (warning)::", 1)[1].splitlines()[0]
+        assert [line for line in out.splitlines() if line.startswith("::")] == [
+            "::group::dummy.py",
+            "::warning file=dummy.py,line=4,endLine=4,col=3,colEnd=7,title=No ToDo::Get it done right away!",
+            f"::error file=dummy.py,line=1,endLine=1,col=3,colEnd=8,title=No fixme (warning)::{hint}",
+            "::endgroup::",
+            "::group::other.py",
+            f"::error file=other.py,line=1,endLine=1,col=3,colEnd=8,title=No fixme (warning)::{hint}",
+            "::endgroup::",
+            "::notice title=relint::Omitted 2 annotation(s) beyond the annotation caps: No fixme (warning) (2)",
+        ]
+        assert exc_info.value.code == 1
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+from relint.__main__ import main
+from relint.config import load_config
+from relint.metrics import COUNTERS, PHASES, Metrics
+from relint.parse import lint_file
+
+
+class TestMetrics:
+    def test_call(self):
+        metrics = Metrics()
+        metrics("read", 0.5)
+        metrics("read", 0.25)
+        metrics("matches", 2)
+        metrics("custom", 1)
+
+        assert metrics.timings["read"] == 0.75
+        assert metrics.counters["matches"] == 2
+        assert metrics.counters["custom"] == 1
+
+    def test_timer(self):
+        metrics = Metrics()
+        with metrics.timer("render"):
+            pass
+
+        assert metrics.timings["render"] > 0
+
+    def test_as_dict(self):
+        data = Metrics().as_dict()
+
+        assert tuple(data["timings"]) == PHASES
+        assert tuple(data["counters"]) == COUNTERS
+
+
+def test_lint_file__hook(tmpdir, fixture_dir):
+    tmpdir.join("dummy.py").write("# TODO do something\n# FIXME too\n")
+    tmpdir.join("dummy.txt").write("# TODO do something")
+    with (fixture_dir / "test.png").open("rb") as fs:
+        tmpdir.join("test.py").write(fs.read(), mode="wb")
+    tmpdir.mkdir("folder.py")
+    events = []
+    with tmpdir.as_cwd():
+        tests = list(load_config(fixture_dir / ".relint.yml", False, False))
+        for path in ["dummy.py", "dummy.txt", "test.py", "folder.py"]:
+            list(lint_file(path, tests, hook=lambda *event: events.append(event)))
+
+    counters = Metrics()
+    for event, value in events:
+        counters(event, value)
+    assert counters.counters == {
+        "files_read": 1,
+        "bytes_read": 32,
+        "files_skipped_binary": 1,
+        "files_skipped_inapplicable": 2,
+        "regex_executions": 3,
+        "matches": 2,
+        "cache_hits": 2,
+    }
+    assert counters.timings["read"] > 0
+    assert counters.timings["scan"] > 0
+
+
+def test_stats_json(tmpdir, fixture_dir):
+    with (fixture_dir / ".relint.yml").open() as fs:
+        config = fs.read()
+    tmpdir.join(".relint.yml").write(config)
+    tmpdir.join("dummy.py").write("# TODO do something")
+    stats_file = tmpdir.join("stats.json")
+    with tmpdir.as_cwd():
+        with pytest.raises(SystemExit) as exc_info:
+            main(["dummy.py", "--stats-json", str(stats_file)])
+
+    assert exc_info.value.code == 0
+    stats = json.loads(stats_file.read())
+    assert stats["counters"]["files_read"] == 1
+    assert stats["counters"]["matches"] == 1
+    assert set(stats["timings"]) == set(PHASES)
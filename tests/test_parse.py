@@ -1,16 +1,29 @@
+import argparse
+import concurrent.futures
+import re
 import subprocess
+import sys
+import time
 import warnings
 
 import pytest
+from relint import parse
 from relint.__main__ import main
-from relint.config import Test
+from relint.config import Test, load_config
 from relint.exceptions import ConfigError
 from relint.parse import (
+    cached_line_index,
+    line_index,
     lint_file,
+    locate,
+    match_position,
     match_with_diff_changes,
     parse_diff,
     parse_filenames,
     parse_line_numbers,
+    parse_suppressions,
+    print_github_actions_output,
+    read_files,
     split_diff_content_by_filename,
 )
 
@@ -254,3 +267,253 @@ def test_cc_linting_rule(tmpdir, fixture_dir):
                 ],
             )
         )
+
+
+class TestSuppressions:
+    def test_parse_suppressions(self):
+        content = (
+            "a = 1  # relint: disable\n"
+            "# relint: disable-next-line=No ToDo, No fixme\n"
+            "b = 2\n"
+            "/* relint: disable=no hint */\n"
+        )
+
+        assert parse_suppressions(content, line_index(content)) == {
+            1: None,
+            3: {"No ToDo", "No fixme"},
+            4: {"no hint"},
+        }
+
+    def test_parse_suppressions__all_rules_win(self):
+        content = "# relint: disable-next-line=No ToDo\n# TODO relint: disable\n"
+
+        assert parse_suppressions(content, line_index(content)) == {2: None}
+
+    def test_parse_suppressions__unknown_directive(self):
+        content = "# relint: disable-everything\n"
+
+        assert parse_suppressions(content, line_index(content)) == {}
+
+    def test_lint_file__suppressions(self, tmpdir, fixture_dir):
+        tmpdir.join("dummy.py").write(
+            "# TODO one\n"
+            "# TODO two  # relint: disable=No ToDo\n"
+            "# relint: disable-next-line\n"
+            "# TODO three\n"
+            "# TODO four  # relint: disable=No fixme (warning)\n"
+        )
+        with tmpdir.as_cwd():
+            tests = list(load_config(fixture_dir / ".relint.yml", False, False))
+            matches = list(lint_file("dummy.py", tests))
+
+        assert [(test.name, line) for _, test, _, line in matches] == [
+            ("No ToDo", 1),
+            ("No ToDo", 5),
+        ]
+
+    def test_match_position(self):
+        content = "first\nsecond line\n\nthird"
+        index = line_index(content)
+        for match in re.finditer(r"\w+\s*|\n", content):
+            line_number = content[: match.start()].count("\n") + 1
+            assert match_position(match, line_number, index) == (
+                content[: match.end()].count("\n") + 1,
+                match.start() - content.rfind("\n", 0, match.start()),
+                match.end() - content.rfind("\n", 0, match.end()),
+            )
+
+    def test_cached_line_index(self):
+        indexes = {}
+        index = cached_line_index(indexes, "dummy.py", "a\nb")
+
+        assert cached_line_index(indexes, "dummy.py", "ignored") is index
+        assert indexes["dummy.py"].offsets == (-1, 1)
+
+
+class TestReadFiles:
+    @pytest.mark.parametrize("read_ahead", [0, 1, 3])
+    def test_read_files(self, read_ahead, tmpdir, fixture_dir):
+        filenames = [f"file{i}.py" for i in range(5)]
+        for filename in filenames:
+            tmpdir.join(filename).write(filename)
+        with tmpdir.as_cwd():
+            tests = list(load_config(fixture_dir / ".relint.yml", False, False))
+            contents = list(
+                read_files([*filenames, "file.txt"], tests, read_ahead=read_ahead)
+            )
+
+        assert contents == [*((f, f) for f in filenames), ("file.txt", None)]
+
+    def test_read_files__error(self, tmpdir, fixture_dir):
+        tmpdir.join("file.py").write("")
+        with tmpdir.as_cwd():
+            tests = list(load_config(fixture_dir / ".relint.yml", False, False))
+            files = read_files(["file.py", "missing.py"], tests, read_ahead=2)
+            assert next(files) == ("file.py", "")
+            with pytest.raises(FileNotFoundError):
+                next(files)
+
+    def test_read_files__close(self, mocker, tmpdir, fixture_dir):
+        filenames = [f"file{i}.py" for i in range(5)]
+        for filename in filenames:
+            tmpdir.join(filename).write("")
+        read_file = mocker.patch("relint.parse.read_file", wraps=parse.read_file)
+        cancel = mocker.spy(concurrent.futures.Future, "cancel")
+        with tmpdir.as_cwd():
+            tests = list(load_config(fixture_dir / ".relint.yml", False, False))
+            files = read_files(filenames, tests, read_ahead=2)
+            assert next(files) == ("file0.py", "")
+            files.close()
+
+        assert cancel.call_count == 2
+        assert {call.args[0] for call in read_file.call_args_list} <= {
+            "file0.py",
+            "file1.py",
+            "file2.py",
+        }
+        with pytest.raises(StopIteration):
+            next(files)
+
+
+@pytest.fixture(params=["python", "numpy"])
+def indexer(request, monkeypatch):
+    """Use either the pure Python or the NumPy line index."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(parse, "NUMPY_MIN_SIZE", 0)
+        monkeypatch.setattr(parse, "NUMPY_MIN_BATCH", 0)
+    else:
+        monkeypatch.setattr(parse, "_numpy", lambda: None)
+    return request.param
+
+
+class TestLineIndex:
+    def test_numpy_import_is_lazy(self):
+        code = "import sys, relint.__main__; print('numpy' in sys.modules)"
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "False"
+
+    def test_numpy_missing(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "numpy", None)
+        parse._numpy.cache_clear()
+        try:
+            assert parse._numpy() is None
+        finally:
+            parse._numpy.cache_clear()
+
+    @pytest.mark.parametrize("content", ["", "a", "a\nb\n\nc", "\n\n", "ä\n😀\nb"])
+    def test_locate(self, indexer, content):
+        index = line_index(content)
+        offsets = range(len(content) + 1)
+
+        assert locate(index, offsets) == [
+            (
+                content[:offset].count("\n") + 1,
+                offset - content.rfind("\n", 0, offset),
+            )
+            for offset in offsets
+        ]
+
+    def test_line_index(self, indexer):
+        assert line_index("a\nb\n\nc").offsets == (-1, 1, 3, 4)
+
+    def test_lint_file(self, indexer, tmpdir, fixture_dir):
+        tmpdir.join("dummy.py").write("ü\n# TODO\n# relint: disable-next-line\n# TODO")
+        with tmpdir.as_cwd():
+            tests = list(load_config(fixture_dir / ".relint.yml", False, False))
+            matches = list(lint_file("dummy.py", tests))
+
+        index = line_index(matches[0][2].string)
+        assert [
+            (line, match_position(match, line, index)) for _, _, match, line in matches
+        ] == [(2, (2, 3, 7))]
+
+
+class TestNumPyCutOff:
+    @pytest.fixture(autouse=True)
+    def numpy(self):
+        return pytest.importorskip("numpy")
+
+    @staticmethod
+    def best_time(func, repeat=7):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def compare(self, monkeypatch, make_index, offsets):
+        numpy_time = self.best_time(lambda: locate(make_index(), offsets))
+        with monkeypatch.context() as m:
+            m.setattr(parse, "_numpy", lambda: None)
+            bisect_time = self.best_time(lambda: locate(make_index(), offsets))
+        return numpy_time, bisect_time
+
+    def test_array_is_built_above_ratio(self, monkeypatch):
+        monkeypatch.setattr(parse, "NUMPY_MIN_SIZE", float("inf"))
+        content = "x\n" * 400
+        offsets = list(range(0, len(content), 4))
+        index = line_index(content)
+
+        assert index.array is None
+        locate(index, offsets[:20])
+        assert index.array is None
+        locate(index, offsets[:50])
+        assert index.array is None
+        positions = locate(index, offsets)
+        assert index.array is not None
+        assert positions == [(o // 2 + 1, o % 2 + 1) for o in offsets]
+
+    def test_not_slower__prebuilt_array(self, monkeypatch):
+        content = "x" * 39 + "\n"
+        content *= 500_000 // len(content) * 20
+        index = line_index(content)
+        offsets = sorted(range(0, len(content), len(content) // parse.NUMPY_MIN_BATCH))
+
+        assert index.array is not None
+        numpy_time, bisect_time = self.compare(
+            monkeypatch, lambda: index, offsets[: parse.NUMPY_MIN_BATCH]
+        )
+        assert numpy_time <= bisect_time
+
+    def test_not_slower__index_ratio(self, monkeypatch):
+        monkeypatch.setattr(parse, "NUMPY_MIN_SIZE", float("inf"))
+        content = ("x" * 39 + "\n") * 60_000
+        index = line_index(content).offsets
+        count = -(-len(index) // parse.NUMPY_INDEX_RATIO)
+        offsets = list(range(0, len(content), len(content) // count))[:count]
+
+        numpy_time, bisect_time = self.compare(
+            monkeypatch, lambda: parse.LineIndex(index), offsets
+        )
+        assert numpy_time <= bisect_time
+
+
+def test_print_github_actions_output__interleaved_files(capsys, tmpdir, fixture_dir):
+    tmpdir.join("a.py").write("# TODO\n\n  # TODO")
+    tmpdir.join("b.py").write("\n\n\n# TODO")
+    with tmpdir.as_cwd():
+        tests = list(load_config(fixture_dir / ".relint.yml", False, False))
+        a, b = list(lint_file("a.py", tests)), list(lint_file("b.py", tests))
+    args = argparse.Namespace(
+        max_annotations_per_file=None, max_annotations_per_rule=None
+    )
+
+    assert print_github_actions_output([a[0], *b, a[1]], args) is False
+    assert [
+        line.split(",title")[0] for line in capsys.readouterr().out.splitlines()
+    ] == [
+        "::group::a.py",
+        "::warning file=a.py,line=1,endLine=1,col=3,colEnd=7",
+        "::endgroup::",
+        "::group::b.py",
+        "::warning file=b.py,line=4,endLine=4,col=3,colEnd=7",
+        "::endgroup::",
+        "::group::a.py",
+        "::warning file=a.py,line=3,endLine=3,col=5,colEnd=9",
+        "::endgroup::",
+    ]
@@ -0,0 +1,156 @@
+import argparse
+import json
+
+import pytest
+from relint.__main__ import main
+from relint.exceptions import ResultsError
+from relint.shard import parse_shard, read_results, shard_files
+
+
+class TestParseShard:
+    def test_valid(self):
+        assert parse_shard("2/3") == (2, 3)
+
+    @pytest.mark.parametrize("value", ["1", "a/b", "0/2", "3/2", "1/2/3"])
+    def test_invalid(self, value):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard(value)
+
+
+class TestShardFiles:
+    @pytest.mark.parametrize("weighted", [False, True])
+    def test_partition(self, weighted, tmpdir):
+        filenames = [f"file{i}.py" for i in range(20)]
+        for i, filename in enumerate(filenames):
+            tmpdir.join(filename).write("x" * i)
+        with tmpdir.as_cwd():
+            shards = [
+                shard_files(filenames, i, 3, weighted=weighted) for i in range(1, 4)
+            ]
+            reversed_shards = [
+                shard_files(filenames[::-1], i, 3, weighted=weighted)
+                for i in range(1, 4)
+            ]
+
+        assert sorted(f for shard in shards for f in shard) == sorted(filenames)
+        assert all(shards)
+        assert [sorted(shard) for shard in shards] == [
+            sorted(shard) for shard in reversed_shards
+        ]
+        for shard in shards:
+            assert shard == [f for f in filenames if f in shard]
+
+    def test_weighted(self, tmpdir):
+        tmpdir.join("large.py").write("x" * 100)
+        tmpdir.join("small.py").write("x")
+        with tmpdir.as_cwd():
+            filenames = ["small.py", "large.py", "tiny.py", "missing.py"]
+            shards = [shard_files(filenames, i, 2, weighted=True) for i in (1, 2)]
+
+        assert shards == [["large.py"], ["small.py", "tiny.py", "missing.py"]]
+
+
+@pytest.mark.parametrize(
+    "content,message",
+    [
+        (json.dumps({"version": 0}), "Unsupported relint results file"),
+        ('{"version": 1, "rul', "Error parsing relint results file"),
+        ("[]", "Unsupported relint results file"),
+        (json.dumps({"version": 1}), "Malformed relint results file"),
+        (
+            json.dumps({"version": 1, "rules": [], "files": {}, "matches": [[1]]}),
+            "Malformed relint results file",
+        ),
+        (
+            json.dumps(
+                {"version": 1, "rules": [], "files": {}, "matches": [["a", 0, 0, 0, 1]]}
+            ),
+            "Malformed relint results file",
+        ),
+    ],
+)
+def test_read_results__invalid(content, message, tmpdir):
+    path = str(tmpdir.join("results.json"))
+    tmpdir.join("results.json").write(content)
+
+    with pytest.raises(ResultsError) as exc_info:
+        read_results([path])
+
+    assert str(exc_info.value) == f"{message}: {path}"
+
+
+@pytest.mark.parametrize("output_args", [[], ["--summarize"]])
+def test_merge(output_args, capsys, tmpdir, fixture_dir):
+    with (fixture_dir / ".relint.yml").open() as fs:
+        config = fs.read()
+    tmpdir.join(".relint.yml").write(config)
+    filenames = [f"file{i}.py" for i in range(6)]
+    for i, filename in enumerate(filenames):
+        tmpdir.join(filename).write(f"# TODO {i}\n# FIXME {i}\n" if i % 2 else "x\n")
+
+    with tmpdir.as_cwd():
+        with pytest.raises(SystemExit) as exc_info:
+            main([*filenames, *output_args])
+        expected_code = exc_info.value.code
+        expected = capsys.readouterr().out.split("\n", 1)[1]
+
+        for i in (1, 2):
+            with pytest.raises(SystemExit):
+                main([*filenames, f"--shard={i}/2", f"--results-json=results{i}.json"])
+        capsys.readouterr()
+
+        with pytest.raises(SystemExit) as exc_info:
+            main(["merge", "results1.json", "results2.json", *output_args])
+
+    out, _ = capsys.readouterr()
+    assert exc_info.value.code == expected_code == 1
+    for i in (1, 3, 5):
+        assert f"file{i}.py:1" in out
+    assert sorted(out.splitlines()) == sorted(expected.splitlines())
+
+
+def test_merge__github_workflow_output(monkeypatch, capsys, tmpdir, fixture_dir):
+    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+    with (fixture_dir / ".relint.yml").open() as fs:
+        config = fs.read()
+    tmpdir.join(".relint.yml").write(config)
+    tmpdir.join("dummy.py").write("x = 1\n# TODO do something")
+    with tmpdir.as_cwd():
+        with pytest.raises(SystemExit):
+            main(["dummy.py", "--shard=1/1", "--results-json=results.json"])
+        capsys.readouterr()
+        with pytest.raises(SystemExit) as exc_info:
+            main(["merge", "results.json"])
+
+    out, _ = capsys.readouterr()
+    assert (
+        "::warning file=dummy.py,line=2,endLine=2,col=3,colEnd=7,title=No ToDo::Get it done right away!"
+        in out
+    )
+    assert exc_info.value.code == 0
+
+
+def test_merge__tuple_args(capsys, tmpdir):
+    tmpdir.join(".relint.yml").write("- name: No ToDo\n  pattern: TODO\n  error: false")
+    tmpdir.join("merge").write("# TODO")
+    with tmpdir.as_cwd():
+        with pytest.raises(SystemExit):
+            main(("./merge", "--results-json=results.json"))
+        with pytest.raises(SystemExit) as exc_info:
+            main(("merge", "results.json"))
+
+    assert exc_info.value.code == 0
+    assert "./merge:1" in capsys.readouterr().out
+
+
+def test_merge__does_not_fall_through(mocker, tmpdir):
+    tmpdir.join("results.json").write(
+        json.dumps({"version": 1, "rules": [], "files": {}, "matches": []})
+    )
+    exit = mocker.patch("relint.__main__.exit", create=True)
+    parse_args = mocker.patch("relint.__main__.parse_args")
+    with tmpdir.as_cwd():
+        main(["merge", "results.json"])
+
+    exit.assert_called_once_with(0)
+    parse_args.assert_not_called()